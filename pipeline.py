@@ -8,6 +8,14 @@ import argparse
 import json
 import sys
 from pathlib import Path
+from typing import Optional
+
+try:
+    import orjson
+
+    _ORJSON_SUPPORTED = True
+except ImportError:  # orjson é opcional; usa o json da biblioteca padrão
+    _ORJSON_SUPPORTED = False
 
 from src import BackupPipeline, BackupPipelineError, BackupResults, ConfigManager
 
@@ -33,6 +41,9 @@ Exemplos de uso:
   # Execução em modo dry-run (simulação)
   python pipeline.py --dry-run
 
+  # Uploads com cliente assíncrono (requer aioboto3)
+  python pipeline.py --async
+
   # Criar arquivo de configuração de exemplo
   python pipeline.py --create-config
 
@@ -55,6 +66,13 @@ Exemplos de uso:
         help="Executa em modo simulação (não faz upload nem deleção real)",
     )
 
+    parser.add_argument(
+        "--async",
+        dest="use_async",
+        action="store_true",
+        help="Executa os uploads com cliente assíncrono (requer aioboto3)",
+    )
+
     parser.add_argument(
         "--create-config",
         action="store_true",
@@ -139,8 +157,12 @@ def save_results_json(results: BackupResults, output_path: str) -> None:
         output_path: Caminho do arquivo de saída
     """
     try:
-        with open(output_path, "w", encoding="utf-8") as f:
-            json.dump(results.to_dict(), f, indent=2, ensure_ascii=False)
+        if _ORJSON_SUPPORTED:
+            with open(output_path, "wb") as fb:
+                fb.write(orjson.dumps(results.to_dict(), option=orjson.OPT_INDENT_2))
+        else:
+            with open(output_path, "w", encoding="utf-8") as f:
+                json.dump(results.to_dict(), f, indent=2, ensure_ascii=False)
         print(f"📄 Resultados salvos em: {output_path}")
 
     except Exception as e:
@@ -168,6 +190,8 @@ def main() -> None:
         print("💡 Use --create-config para criar um arquivo de exemplo")
         sys.exit(1)
 
+    pipeline: Optional[BackupPipeline] = None
+
     try:
         # Inicializa pipeline
         print("🚀 Inicializando Pipeline de Backup S3...")
@@ -178,7 +202,10 @@ def main() -> None:
             print("🔍 Executando em modo DRY-RUN (simulação)")
 
         # Executa backup
-        results = pipeline.run_backup(dry_run=args.dry_run)
+        results = pipeline.run_backup(dry_run=args.dry_run, use_async=args.use_async)
+
+        # Escreve os logs pendentes antes de exibir o resumo no console
+        pipeline.close()
 
         # Assertions para MyPy
         assert pipeline.config is not None
@@ -223,6 +250,10 @@ def main() -> None:
         print(f"\n❌ Erro inesperado: {e}")
         sys.exit(1)
 
+    finally:
+        if pipeline is not None:
+            pipeline.close()
+
 
 if __name__ == "__main__":
     main()
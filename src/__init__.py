@@ -5,7 +5,7 @@ Fornece funcionalidades para backup automatizado de arquivos para Amazon S3.
 
 from .backup_pipeline import BackupPipeline, BackupResults, BackupPipelineError
 from .config import AppConfig, ConfigManager
-from .file_manager import FileManager, FileOperationError
+from .file_manager import FileEntry, FileManager, FileOperationError
 from .logger import LoggerManager, setup_logger
 from .s3_manager import S3Manager, S3UploadError
 
@@ -19,6 +19,7 @@ __all__ = [
     "BackupPipelineError",
     "AppConfig",
     "ConfigManager",
+    "FileEntry",
     "FileManager",
     "FileOperationError",
     "LoggerManager",
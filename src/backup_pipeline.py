@@ -3,14 +3,32 @@ Pipeline principal de backup para S3.
 Orquestra todo o processo de backup, upload e limpeza de arquivos.
 """
 
+import asyncio
+import itertools
+import logging
+import os
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Future,
+    ThreadPoolExecutor,
+    as_completed,
+    wait,
+)
 from datetime import datetime
-from typing import Any, Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple, Union
 
 from .config import AppConfig, ConfigManager
-from .file_manager import FileManager
+from .file_manager import FileEntry, FileManager
 from .logger import LoggerManager
 from .s3_manager import S3Manager
 
+# os.unlink libera o GIL, então deleções em paralelo se sobrepõem no kernel
+DELETE_WORKERS = 8
+
+# Arquivos lidos da varredura por vez no modo assíncrono, fora do event loop
+SCAN_BATCH_SIZE = 64
+
 
 class BackupPipelineError(Exception):
     """Exceção customizada para erros da pipeline de backup."""
@@ -21,28 +39,105 @@ class BackupPipelineError(Exception):
 class BackupResults:
     """Classe para armazenar os resultados da execução da pipeline."""
 
-    def __init__(self) -> None:
+    def __init__(self, source_directory: str = "") -> None:
+        """
+        Inicializa os resultados.
+
+        Args:
+            source_directory: Diretório de origem; os caminhos sob ele são
+                armazenados de forma relativa para economizar memória
+        """
+        # Horário de parede só para o relatório; a duração usa o relógio monotônico
         self.start_time = datetime.now()
         self.end_time: Optional[datetime] = None
+        self._t0 = time.monotonic()
+        self._t1: Optional[float] = None
         self.total_files = 0
         self.successful_uploads = 0
         self.failed_uploads = 0
+        self.skipped_files = 0
         self.deleted_files = 0
         self.failed_deletions = 0
-        self.upload_errors: List[Tuple[str, str]] = []  # (file_path, error_message)
-        self.deletion_errors: List[Tuple[str, str]] = []  # (file_path, error_message)
-        self.uploaded_files: List[Tuple[str, str]] = []  # (local_path, s3_key)
+
+        # Listas paralelas (uma por coluna) em vez de listas de tuplas
+        self._root = os.path.join(source_directory, "") if source_directory else ""
+        self._uploaded_paths: List[str] = []
+        self._uploaded_keys: List[str] = []
+        self._upload_error_paths: List[str] = []
+        self._upload_error_messages: List[str] = []
+        self._deletion_error_paths: List[str] = []
+        self._deletion_error_messages: List[str] = []
+
+    def _relative(self, file_path: str) -> str:
+        """Remove o diretório de origem do início de um caminho absoluto."""
+        if self._root and file_path.startswith(self._root):
+            return file_path[len(self._root) :]
+        return file_path
+
+    def _absolute(self, file_path: str) -> str:
+        """Reconstrói o caminho absoluto armazenado por _relative."""
+        if os.path.isabs(file_path):
+            return file_path
+        return self._root + file_path
+
+    def add_uploaded_file(self, file_path: str, s3_key: str) -> None:
+        """Registra um arquivo enviado (ou já presente) no S3."""
+        self._uploaded_paths.append(self._relative(file_path))
+        self._uploaded_keys.append(s3_key)
+
+    def add_upload_error(self, file_path: str, error_message: str) -> None:
+        """Registra um erro de upload."""
+        self._upload_error_paths.append(self._relative(file_path))
+        self._upload_error_messages.append(error_message)
+
+    def add_deletion_error(self, file_path: str, error_message: str) -> None:
+        """Registra um erro de deleção local."""
+        self._deletion_error_paths.append(self._relative(file_path))
+        self._deletion_error_messages.append(error_message)
+
+    @property
+    def uploaded_files(self) -> List[Tuple[str, str]]:
+        """Arquivos enviados como (local_path, s3_key)."""
+        return [
+            (self._absolute(path), key)
+            for path, key in zip(self._uploaded_paths, self._uploaded_keys)
+        ]
+
+    @property
+    def uploaded_count(self) -> int:
+        """Quantidade de arquivos enviados, sem montar a lista de pares."""
+        return len(self._uploaded_paths)
+
+    @property
+    def upload_errors(self) -> List[Tuple[str, str]]:
+        """Erros de upload como (file_path, error_message)."""
+        return [
+            (self._absolute(path), message)
+            for path, message in zip(
+                self._upload_error_paths, self._upload_error_messages
+            )
+        ]
+
+    @property
+    def deletion_errors(self) -> List[Tuple[str, str]]:
+        """Erros de deleção como (file_path, error_message)."""
+        return [
+            (self._absolute(path), message)
+            for path, message in zip(
+                self._deletion_error_paths, self._deletion_error_messages
+            )
+        ]
 
     def finish(self) -> None:
         """Marca o fim da execução."""
+        self._t1 = time.monotonic()
         self.end_time = datetime.now()
 
     @property
     def duration(self) -> float:
         """Duração da execução em segundos."""
-        if self.end_time:
-            return (self.end_time - self.start_time).total_seconds()
-        return (datetime.now() - self.start_time).total_seconds()
+        end = self._t1 if self._t1 is not None else time.monotonic()
+        return end - self._t0
 
     @property
     def success_rate(self) -> float:
@@ -60,6 +155,7 @@ class BackupResults:
             "total_files": self.total_files,
             "successful_uploads": self.successful_uploads,
             "failed_uploads": self.failed_uploads,
+            "skipped_files": self.skipped_files,
             "deleted_files": self.deleted_files,
             "failed_deletions": self.failed_deletions,
             "success_rate_percent": self.success_rate,
@@ -97,6 +193,7 @@ class BackupPipeline:
             # Carrega configuração
             config_manager = ConfigManager(self.config_path)
             self.config = config_manager.load_config()
+            self.config.backup.ensure_source()
 
             # Inicializa logger
             self.logger_manager = LoggerManager(self.config.logging)
@@ -108,7 +205,10 @@ class BackupPipeline:
             # Inicializa gerenciadores
             self.file_manager = FileManager(self.config.backup, self.logger_manager)
             self.s3_manager = S3Manager(
-                self.config.aws, self.config.s3, self.logger_manager
+                self.config.aws,
+                self.config.s3,
+                self.logger_manager,
+                max_workers=self.config.backup.max_workers,
             )
 
             # Verifica acesso ao bucket S3
@@ -123,12 +223,21 @@ class BackupPipeline:
                 self.logger_manager.get_logger().error(error_msg)
             raise BackupPipelineError(error_msg)
 
-    def run_backup(self, dry_run: bool = False) -> BackupResults:
+    def close(self) -> None:
+        """Libera os recursos da pipeline, escrevendo os logs pendentes."""
+        if self.logger_manager is not None:
+            self.logger_manager.close()
+
+    def run_backup(
+        self, dry_run: bool = False, use_async: bool = False
+    ) -> BackupResults:
         """
         Executa o processo completo de backup.
 
         Args:
             dry_run: Se True, apenas simula a execução sem fazer upload/deleção
+            use_async: Se True, executa os uploads com o cliente assíncrono
+                (aioboto3) em vez do pool de threads
 
         Returns:
             BackupResults: Resultados da execução
@@ -147,7 +256,7 @@ class BackupPipeline:
         assert self.file_manager is not None
         assert self.s3_manager is not None
 
-        results = BackupResults()
+        results = BackupResults(self.config.backup.source_directory)
         logger = self.logger_manager.get_logger()
 
         try:
@@ -158,35 +267,38 @@ class BackupPipeline:
             if dry_run:
                 logger.info("MODO DRY-RUN: Nenhuma operação será executada")
 
-            # 1. Lista arquivos para backup
-            logger.info("Fase 1: Listando arquivos para backup...")
+            # 1. Lista arquivos e executa uploads conforme são encontrados
+            logger.info("Fase 1: Listando arquivos e executando uploads para S3...")
             files_to_backup = self.file_manager.list_files_to_backup()
-            results.total_files = len(files_to_backup)
+            if use_async and not dry_run:
+                backed_up_files = asyncio.run(
+                    self._upload_files_async(files_to_backup, results)
+                )
+            else:
+                backed_up_files = self._upload_files(files_to_backup, results, dry_run)
 
             if results.total_files == 0:
                 logger.warning("Nenhum arquivo encontrado para backup")
                 results.finish()
                 return results
 
-            logger.info(f"Encontrados {results.total_files} arquivos para backup")
+            logger.info(f"Processados {results.total_files} arquivos para backup")
 
-            # 2. Cria manifest de backup
+            # 2. Cria manifest de backup (antes de qualquer deleção local)
             if not dry_run:
-                manifest_path = self.file_manager.create_backup_manifest(
-                    files_to_backup
-                )
+                manifest_files = sorted(backed_up_files, key=lambda entry: entry.path)
+                manifest_path = self.file_manager.create_backup_manifest(manifest_files)
                 logger.info(f"Manifest criado: {manifest_path}")
 
-            # 3. Executa upload dos arquivos
-            logger.info("Fase 2: Executando uploads para S3...")
-            self._upload_files(files_to_backup, results, dry_run)
+                if self.config.backup.upload_manifest:
+                    self._upload_manifest(manifest_path, manifest_files)
 
-            # 4. Deleta arquivos locais se configurado
+            # 3. Deleta arquivos locais se configurado
             if self.config.backup.delete_after_upload:
-                logger.info("Fase 3: Deletando arquivos locais...")
+                logger.info("Fase 2: Deletando arquivos locais...")
                 self._delete_local_files(results, dry_run)
 
-                # 5. Limpa diretórios vazios
+                # 4. Limpa diretórios vazios
                 if not dry_run:
                     removed_dirs = self.file_manager.cleanup_empty_directories()
                     if removed_dirs > 0:
@@ -205,51 +317,405 @@ class BackupPipeline:
             self.logger_manager.log_operation_error("backup_pipeline", e)
             raise BackupPipelineError(f"Erro na execução da pipeline: {e}")
 
+    def _upload_manifest(self, manifest_path: str, files: List[FileEntry]) -> None:
+        """
+        Envia o manifest para o S3 em streaming, gerando-o durante o envio.
+
+        Args:
+            manifest_path: Caminho do manifest local (define o nome no S3)
+            files: Arquivos listados no manifest
+        """
+        assert self.logger_manager is not None
+        assert self.file_manager is not None
+        assert self.s3_manager is not None
+
+        logger = self.logger_manager.get_logger()
+        s3_key = self.s3_manager.generate_s3_key(manifest_path)
+
+        with self.file_manager.stream_backup_manifest(files) as stream:
+            success, result = self.s3_manager.upload_stream(s3_key, stream)
+
+        if success:
+            logger.info(f"Manifest enviado para o S3: {result}")
+        else:
+            logger.error(f"Falha ao enviar manifest para o S3: {result}")
+
     def _upload_files(
-        self, files: List[str], results: BackupResults, dry_run: bool
-    ) -> None:
+        self, files: Iterable[FileEntry], results: BackupResults, dry_run: bool
+    ) -> List[FileEntry]:
         """
         Executa upload dos arquivos para S3.
 
+        Os uploads são submetidos à medida que os arquivos são produzidos pela
+        varredura, com no máximo 2 * max_workers uploads pendentes.
+
         Args:
-            files: Lista de arquivos para upload
+            files: Arquivos para upload (pode ser um gerador)
             results: Objeto de resultados
             dry_run: Se True, apenas simula
+
+        Returns:
+            List[FileEntry]: Arquivos processados (vazia em dry-run)
         """
+        assert self.config is not None
         assert self.logger_manager is not None
+        assert self.file_manager is not None
         assert self.s3_manager is not None
 
         logger = self.logger_manager.get_logger()
+        processed_files: List[FileEntry] = []
+
+        if dry_run:
+            # Só conta: a varredura ainda roda, mas sem log nem lista por arquivo
+            simulated = sum(1 for _ in files)
+            results.total_files += simulated
+            results.successful_uploads += simulated
+            logger.info(f"[DRY-RUN] Simulando upload de {simulated} arquivos")
+            return processed_files
+
+        max_workers = self.config.backup.max_workers
+        max_pending = max_workers * 2
+        # Os próximos max_pending arquivos já são lidos para o page cache
+        prefetch = self.config.backup.prefetch_files
+        counter = itertools.count(1)
+        last_progress = time.monotonic()
+        existing = self._load_existing_objects()
+
+        # O cliente boto3 é thread-safe; os resultados são consolidados apenas
+        # nesta thread, à medida que os uploads terminam
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            pending: Dict[Future, str] = {}
+
+            for entry in files:
+                file_path = entry.path
+                if len(pending) >= max_pending:
+                    done, _ = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        index = next(counter)
+                        self._record_upload(pending.pop(future), future, results, index)
+                        last_progress = self._log_upload_progress(
+                            results, index, last_progress
+                        )
+
+                results.total_files += 1
+                processed_files.append(entry)
+                if prefetch and self._will_upload(entry, existing):
+                    self.file_manager.prefetch_file(file_path)
+                future = executor.submit(self._upload_one, entry, existing)
+                pending[future] = file_path
+
+            for future in as_completed(pending):
+                index = next(counter)
+                self._record_upload(pending[future], future, results, index)
+                last_progress = self._log_upload_progress(results, index, last_progress)
+
+        return processed_files
+
+    def _load_existing_objects(self) -> Optional[Dict[str, Tuple[int, float]]]:
+        """
+        Lista os objetos já enviados, se skip_unchanged estiver habilitado.
 
-        for i, file_path in enumerate(files, 1):
-            logger.info(f"Processando arquivo {i}/{len(files)}: {file_path}")
+        Returns:
+            Optional[Dict[str, Tuple[int, float]]]: chave -> (tamanho,
+                last_modified), ou None se a verificação estiver desabilitada
+        """
+        assert self.config is not None
+        assert self.logger_manager is not None
+        assert self.s3_manager is not None
 
-            if dry_run:
-                logger.info(f"[DRY-RUN] Simulando upload: {file_path}")
+        if not self.config.backup.skip_unchanged:
+            return None
+
+        existing = dict(self.s3_manager.iter_existing())
+        self.logger_manager.get_logger().info(
+            f"Encontrados {len(existing)} objetos já existentes no S3"
+        )
+        return existing
+
+    def _will_upload(
+        self,
+        entry: FileEntry,
+        existing: Optional[Dict[str, Tuple[int, float]]],
+    ) -> bool:
+        """
+        Indica se o arquivo será enviado, para antecipar só a leitura desses.
+
+        Args:
+            entry: Arquivo da varredura
+            existing: Objetos já existentes, de _load_existing_objects
+
+        Returns:
+            bool: False se o arquivo será pulado por já estar no S3
+        """
+        assert self.s3_manager is not None
+
+        if existing is None:
+            return True
+        remote = existing.get(self.s3_manager.generate_s3_key(entry))
+        return not self.s3_manager.is_unchanged(remote, entry.size, entry.mtime)
+
+    def _upload_one(
+        self,
+        entry: FileEntry,
+        existing: Optional[Dict[str, Tuple[int, float]]] = None,
+    ) -> Tuple[bool, str, bool]:
+        """
+        Faz o upload de um arquivo, pulando-o se já estiver atualizado no S3.
+
+        Args:
+            entry: Arquivo para upload
+            existing: Objetos já existentes, de _load_existing_objects
+
+        Returns:
+            Tuple[bool, str, bool]: (sucesso, chave_s3_ou_erro, pulado)
+        """
+        assert self.config is not None
+        assert self.s3_manager is not None
+
+        if existing is not None:
+            s3_key = self.s3_manager.generate_s3_key(entry)
+            remote = existing.get(s3_key)
+            # Arquivos pulados entram na deleção local; nesse caso o critério
+            # da listagem não basta e o objeto é conferido com head_object
+            if self.s3_manager.is_unchanged(remote, entry.size, entry.mtime) and (
+                not self.config.backup.delete_after_upload
+                or self.s3_manager.matches_remote(s3_key, entry.size, entry.mtime)
+            ):
+                return True, s3_key, True
+            success, result = self.s3_manager.upload_file(entry, s3_key)
+        else:
+            success, result = self.s3_manager.upload_file(entry)
+
+        return success, result, False
+
+    async def _upload_files_async(
+        self, files: Iterable[FileEntry], results: BackupResults
+    ) -> List[FileEntry]:
+        """
+        Executa upload dos arquivos para S3 com um único event loop.
+
+        Mantém no máximo max_workers uploads em andamento; como as corrotinas
+        rodam na mesma thread, os resultados são atualizados sem locks. A
+        varredura (scandir/stat) e o prefetch rodam em uma thread, em lotes,
+        para não bloquear o event loop; o próximo lote é lido enquanto o
+        atual é enviado.
+
+        Args:
+            files: Arquivos para upload (pode ser um gerador)
+            results: Objeto de resultados
+
+        Returns:
+            List[FileEntry]: Arquivos processados
+        """
+        assert self.config is not None
+        assert self.file_manager is not None
+        assert self.s3_manager is not None
+
+        max_workers = self.config.backup.max_workers
+        processed_files: List[FileEntry] = []
+        counter = itertools.count(1)
+        last_progress = time.monotonic()
+        loop = asyncio.get_running_loop()
+        existing = await loop.run_in_executor(None, self._load_existing_objects)
+        entries = iter(files)
+
+        async with self.s3_manager.create_async_client() as client:
+            pending: Dict[asyncio.Task, str] = {}
+            next_batch = loop.run_in_executor(
+                None, self._next_scan_batch, entries, existing
+            )
+
+            while True:
+                batch = await next_batch
+                if not batch:
+                    break
+                next_batch = loop.run_in_executor(
+                    None, self._next_scan_batch, entries, existing
+                )
+
+                for entry in batch:
+                    if len(pending) >= max_workers:
+                        done, _ = await asyncio.wait(
+                            pending, return_when=asyncio.FIRST_COMPLETED
+                        )
+                        for task in done:
+                            index = next(counter)
+                            self._record_upload(pending.pop(task), task, results, index)
+                            last_progress = self._log_upload_progress(
+                                results, index, last_progress
+                            )
+
+                    results.total_files += 1
+                    processed_files.append(entry)
+                    task = asyncio.ensure_future(
+                        self._upload_one_async(client, entry, existing)
+                    )
+                    pending[task] = entry.path
+
+            while pending:
+                done, _ = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    index = next(counter)
+                    self._record_upload(pending.pop(task), task, results, index)
+                    last_progress = self._log_upload_progress(
+                        results, index, last_progress
+                    )
+
+        return processed_files
+
+    def _next_scan_batch(
+        self,
+        entries: Iterator[FileEntry],
+        existing: Optional[Dict[str, Tuple[int, float]]] = None,
+    ) -> List[FileEntry]:
+        """
+        Lê o próximo lote da varredura, antecipando a leitura se configurado.
+
+        Chamado em uma thread pelo modo assíncrono; nunca há mais de uma
+        chamada em andamento para o mesmo iterador.
+
+        Args:
+            entries: Iterador da varredura de arquivos
+            existing: Objetos já existentes, de _load_existing_objects
+
+        Returns:
+            List[FileEntry]: Até SCAN_BATCH_SIZE arquivos (vazia no fim)
+        """
+        assert self.config is not None
+        assert self.file_manager is not None
+
+        batch = list(itertools.islice(entries, SCAN_BATCH_SIZE))
+        if self.config.backup.prefetch_files:
+            for entry in batch:
+                if self._will_upload(entry, existing):
+                    self.file_manager.prefetch_file(entry.path)
+        return batch
+
+    async def _upload_one_async(
+        self,
+        client: Any,
+        entry: FileEntry,
+        existing: Optional[Dict[str, Tuple[int, float]]] = None,
+    ) -> Tuple[bool, str, bool]:
+        """
+        Versão assíncrona de _upload_one.
+
+        Args:
+            client: Cliente S3 assíncrono
+            entry: Arquivo para upload
+            existing: Objetos já existentes, de _load_existing_objects
+
+        Returns:
+            Tuple[bool, str, bool]: (sucesso, chave_s3_ou_erro, pulado)
+        """
+        assert self.config is not None
+        assert self.s3_manager is not None
+
+        s3_key = self.s3_manager.generate_s3_key(entry)
+
+        if existing is not None:
+            remote = existing.get(s3_key)
+            # Arquivos pulados entram na deleção local; nesse caso o critério
+            # da listagem não basta e o objeto é conferido com head_object
+            if self.s3_manager.is_unchanged(remote, entry.size, entry.mtime) and (
+                not self.config.backup.delete_after_upload
+                or await self.s3_manager.matches_remote_async(
+                    client, s3_key, entry.size, entry.mtime
+                )
+            ):
+                return True, s3_key, True
+
+        success, result = await self.s3_manager.upload_file_async(client, entry, s3_key)
+        return success, result, False
+
+    def _record_upload(
+        self,
+        file_path: str,
+        future: Union[Future, "asyncio.Future[Any]"],
+        results: BackupResults,
+        index: int,
+    ) -> None:
+        """
+        Registra nos resultados o desfecho de um upload concluído.
+
+        Args:
+            file_path: Arquivo enviado
+            future: Future do upload
+            results: Objeto de resultados
+            index: Posição do arquivo na ordem de conclusão
+        """
+        assert self.config is not None
+        assert self.logger_manager is not None
+        assert self.file_manager is not None
+
+        logger = self.logger_manager.get_logger()
+        debug_enabled = logger.isEnabledFor(logging.DEBUG)
+        if debug_enabled:
+            logger.debug(
+                "Arquivo processado %d/%d: %s", index, results.total_files, file_path
+            )
+
+        skipped = False
+        try:
+            success, result, skipped = future.result()
+
+            if skipped:
+                # Arquivo já está no S3: conta como sucesso para a deleção local
+                # (com deleção ativa, o pulo foi confirmado com head_object)
+                results.successful_uploads += 1
+                results.skipped_files += 1
+                results.add_uploaded_file(file_path, result)
+                if debug_enabled:
+                    logger.debug("Arquivo inalterado, upload pulado: %s", file_path)
+            elif success:
                 results.successful_uploads += 1
-                continue
-
-            try:
-                success, result = self.s3_manager.upload_file(file_path)
-
-                if success:
-                    results.successful_uploads += 1
-                    results.uploaded_files.append(
-                        (file_path, result)
-                    )  # result é a s3_key
-                    logger.info(f"Upload bem-sucedido: {file_path} -> {result}")
-                else:
-                    results.failed_uploads += 1
-                    results.upload_errors.append(
-                        (file_path, result)
-                    )  # result é a mensagem de erro
-                    logger.error(f"Falha no upload: {file_path} - {result}")
-
-            except Exception as e:
+                results.add_uploaded_file(file_path, result)  # result é a s3_key
+                if debug_enabled:
+                    logger.debug("Upload bem-sucedido: %s -> %s", file_path, result)
+            else:
                 results.failed_uploads += 1
-                error_msg = f"Erro inesperado no upload: {e}"
-                results.upload_errors.append((file_path, error_msg))
-                logger.error(f"Erro no upload de {file_path}: {e}")
+                results.add_upload_error(file_path, result)  # result é o erro
+                logger.error(f"Falha no upload: {file_path} - {result}")
+
+        except Exception as e:
+            results.failed_uploads += 1
+            error_msg = f"Erro inesperado no upload: {e}"
+            results.add_upload_error(file_path, error_msg)
+            logger.error(f"Erro no upload de {file_path}: {e}")
+
+        finally:
+            # Libera as páginas antecipadas também quando o upload falha
+            if self.config.backup.prefetch_files and not skipped:
+                self.file_manager.release_file_cache(file_path)
+
+    def _log_upload_progress(
+        self, results: BackupResults, processed: int, last_log: float
+    ) -> float:
+        """
+        Registra o progresso dos uploads a cada 100 arquivos ou 5 segundos.
+
+        Args:
+            results: Objeto de resultados
+            processed: Número de uploads concluídos
+            last_log: Instante (time.monotonic) do último registro de progresso
+
+        Returns:
+            float: Instante do último registro de progresso
+        """
+        assert self.logger_manager is not None
+
+        now = time.monotonic()
+        if processed % 100 != 0 and now - last_log < 5:
+            return last_log
+
+        self.logger_manager.get_logger().info(
+            f"Progresso: {processed}/{results.total_files} arquivos processados "
+            f"(sucesso: {results.successful_uploads}, "
+            f"falhas: {results.failed_uploads})"
+        )
+        return now
 
     def _delete_local_files(self, results: BackupResults, dry_run: bool) -> None:
         """
@@ -265,28 +731,38 @@ class BackupPipeline:
         logger = self.logger_manager.get_logger()
 
         # Só deleta arquivos que foram uploadados com sucesso
-        for file_path, s3_key in results.uploaded_files:
-            if dry_run:
-                logger.info(f"[DRY-RUN] Simulando deleção: {file_path}")
-                results.deleted_files += 1
-                continue
-
-            try:
-                success, message = self.file_manager.delete_file_safely(file_path)
-
-                if success:
-                    results.deleted_files += 1
-                    logger.info(f"Arquivo deletado: {file_path}")
-                else:
+        if dry_run:
+            simulated = results.uploaded_count
+            results.deleted_files += simulated
+            logger.info(f"[DRY-RUN] Simulando deleção de {simulated} arquivos")
+            return
+
+        delete = self.file_manager.delete_file_safely
+
+        with ThreadPoolExecutor(max_workers=DELETE_WORKERS) as executor:
+            futures = {
+                executor.submit(delete, file_path): file_path
+                for file_path, s3_key in results.uploaded_files
+            }
+
+            for future in as_completed(futures):
+                file_path = futures[future]
+                try:
+                    success, message = future.result()
+
+                    if success:
+                        results.deleted_files += 1
+                        logger.debug("Arquivo deletado: %s", file_path)
+                    else:
+                        results.failed_deletions += 1
+                        results.add_deletion_error(file_path, message)
+                        logger.warning(f"Falha na deleção: {file_path} - {message}")
+
+                except Exception as e:
                     results.failed_deletions += 1
-                    results.deletion_errors.append((file_path, message))
-                    logger.warning(f"Falha na deleção: {file_path} - {message}")
-
-            except Exception as e:
-                results.failed_deletions += 1
-                error_msg = f"Erro inesperado na deleção: {e}"
-                results.deletion_errors.append((file_path, error_msg))
-                logger.error(f"Erro na deleção de {file_path}: {e}")
+                    error_msg = f"Erro inesperado na deleção: {e}"
+                    results.add_deletion_error(file_path, error_msg)
+                    logger.error(f"Erro na deleção de {file_path}: {e}")
 
     def _log_final_summary(self, results: BackupResults) -> None:
         """
@@ -307,6 +783,8 @@ class BackupPipeline:
         logger.info(f"Total de arquivos: {results.total_files}")
         logger.info(f"Uploads bem-sucedidos: {results.successful_uploads}")
         logger.info(f"Uploads falharam: {results.failed_uploads}")
+        if results.skipped_files:
+            logger.info(f"Arquivos inalterados (pulados): {results.skipped_files}")
         logger.info(f"Taxa de sucesso: {results.success_rate:.1f}%")
 
         if self.config.backup.delete_after_upload:
@@ -3,23 +3,33 @@ Módulo de configuração para a pipeline de backup S3.
 Gerencia o carregamento e validação das configurações da aplicação.
 """
 
+import functools
 import os
 from pathlib import Path
-from typing import List, Optional
+from typing import Optional, Tuple
 
 import yaml
 from dotenv import load_dotenv
-from pydantic import BaseModel, Field, validator
+from pydantic import BaseModel, ConfigDict, Field, field_validator
+
+try:
+    # Loader em C (libyaml), bem mais rápido e com as mesmas garantias do safe_load
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # PyYAML compilado sem libyaml
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
 
 
 class AWSConfig(BaseModel):
     """Configurações de autenticação AWS."""
 
+    model_config = ConfigDict(frozen=True)
+
     access_key_id: str = Field(..., description="AWS Access Key ID")
     secret_access_key: str = Field(..., description="AWS Secret Access Key")
     region: str = Field(default="us-east-1", description="AWS Region")
 
-    @validator("access_key_id", "secret_access_key")
+    @field_validator("access_key_id", "secret_access_key")
+    @classmethod
     def validate_credentials(cls, value: str) -> str:
         """Valida se as credenciais não estão vazias."""
         if not value or value.strip() == "":
@@ -30,12 +40,28 @@ class AWSConfig(BaseModel):
 class S3Config(BaseModel):
     """Configurações do bucket S3."""
 
+    model_config = ConfigDict(frozen=True)
+
     bucket_name: str = Field(..., description="Nome do bucket S3")
     prefix: str = Field(
         default="", description="Prefixo para organizar arquivos no bucket"
     )
+    multipart_threshold_mb: int = Field(
+        default=8, ge=5, description="Tamanho a partir do qual o upload é multipart"
+    )
+    multipart_chunksize_mb: int = Field(
+        default=64, ge=5, description="Tamanho de cada parte do upload multipart"
+    )
+    transfer_concurrency: int = Field(
+        default=4, ge=1, description="Partes enviadas simultaneamente por arquivo"
+    )
+    verify_uploads: bool = Field(
+        default=False,
+        description="Se deve conferir cada upload com head_object",
+    )
 
-    @validator("bucket_name")
+    @field_validator("bucket_name")
+    @classmethod
     def validate_bucket_name(cls, value: str) -> str:
         """Valida o nome do bucket S3."""
         if not value or value.strip() == "":
@@ -46,35 +72,66 @@ class S3Config(BaseModel):
 class BackupConfig(BaseModel):
     """Configurações do processo de backup."""
 
+    model_config = ConfigDict(frozen=True)
+
     source_directory: str = Field(..., description="Diretório local para backup")
-    file_extensions: List[str] = Field(
-        default=["*"], description="Extensões de arquivo para backup"
+    file_extensions: Tuple[str, ...] = Field(
+        default=("*",), description="Extensões de arquivo para backup"
     )
     delete_after_upload: bool = Field(
         default=False,
         description="Se deve deletar arquivos locais após upload bem-sucedido",
     )
+    upload_manifest: bool = Field(
+        default=False, description="Se deve enviar o manifest de backup para o S3"
+    )
+    skip_unchanged: bool = Field(
+        default=False,
+        description="Se deve pular arquivos já no S3 e não modificados desde o envio",
+    )
+    prefetch_files: bool = Field(
+        default=False,
+        description="Se deve antecipar a leitura dos próximos arquivos (Linux)",
+    )
+    max_workers: int = Field(
+        default=16, ge=1, description="Número máximo de uploads simultâneos"
+    )
 
-    @validator("source_directory")
+    @field_validator("source_directory")
+    @classmethod
     def validate_source_directory(cls, value: str) -> str:
-        """Valida se o diretório de origem existe."""
-        path = Path(value)
+        """Normaliza o diretório de origem para um caminho absoluto."""
+        return str(Path(value).absolute())
+
+    def ensure_source(self) -> None:
+        """
+        Verifica se o diretório de origem existe.
+
+        Fica fora da validação do modelo para que o sistema de arquivos seja
+        consultado uma vez por execução, e não a cada instanciação.
+
+        Raises:
+            ValueError: Se o diretório não existir ou não for um diretório
+        """
+        path = Path(self.source_directory)
         if not path.exists():
-            raise ValueError(f"Diretório de origem não existe: {value}")
+            raise ValueError(f"Diretório de origem não existe: {self.source_directory}")
         if not path.is_dir():
-            raise ValueError(f"Caminho não é um diretório: {value}")
-        return str(path.absolute())
+            raise ValueError(f"Caminho não é um diretório: {self.source_directory}")
 
 
 class LoggingConfig(BaseModel):
     """Configurações de logging."""
 
+    model_config = ConfigDict(frozen=True)
+
     level: str = Field(default="INFO", description="Nível de log")
     log_file: str = Field(default="logs/backup.log", description="Arquivo de log")
     max_log_size_mb: int = Field(default=10, description="Tamanho máximo do log em MB")
     backup_count: int = Field(default=5, description="Número de backups de log")
 
-    @validator("level")
+    @field_validator("level")
+    @classmethod
     def validate_log_level(cls, value: str) -> str:
         """Valida o nível de log."""
         valid_levels = ["DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"]
@@ -86,12 +143,23 @@ class LoggingConfig(BaseModel):
 class AppConfig(BaseModel):
     """Configuração principal da aplicação."""
 
+    model_config = ConfigDict(frozen=True)
+
     aws: AWSConfig
     s3: S3Config
     backup: BackupConfig
     logging: LoggingConfig
 
 
+# Variáveis de ambiente que sobrescrevem o arquivo (fazem parte da chave do cache)
+_ENV_OVERRIDES = (
+    "AWS_ACCESS_KEY_ID",
+    "AWS_SECRET_ACCESS_KEY",
+    "AWS_DEFAULT_REGION",
+    "S3_BUCKET_NAME",
+)
+
+
 class ConfigManager:
     """Gerenciador de configurações da aplicação."""
 
@@ -130,21 +198,51 @@ class ConfigManager:
                 f"Copie {self.config_path}.template para {self.config_path} e configure."
             )
 
+        stat = config_file.stat()
+        env = tuple(os.getenv(name) for name in _ENV_OVERRIDES)
+        return self._parse_config(
+            str(config_file.resolve()), stat.st_mtime_ns, stat.st_size, env
+        )
+
+    @staticmethod
+    @functools.lru_cache(maxsize=8)
+    def _parse_config(
+        path: str, mtime_ns: int, size: int, env: Tuple[Optional[str], ...]
+    ) -> AppConfig:
+        """
+        Lê e valida o arquivo de configuração, com cache por versão do arquivo.
+
+        Chamadas repetidas com o mesmo arquivo (mesmo mtime e tamanho) e as
+        mesmas variáveis de ambiente reutilizam a configuração já validada.
+
+        Args:
+            path: Caminho absoluto do arquivo de configuração
+            mtime_ns: Data de modificação do arquivo em nanossegundos
+            size: Tamanho do arquivo em bytes
+            env: Valores das variáveis de ambiente de _ENV_OVERRIDES
+
+        Returns:
+            AppConfig: Configuração validada da aplicação
+
+        Raises:
+            ValueError: Se a configuração for inválida
+        """
         try:
-            with open(config_file, "r", encoding="utf-8") as file:
-                config_data = yaml.safe_load(file)
+            with open(path, "r", encoding="utf-8") as file:
+                config_data = yaml.load(file, Loader=_SafeLoader)
         except yaml.YAMLError as e:
             raise ValueError(f"Erro ao ler arquivo de configuração YAML: {e}")
 
         # Sobrescreve com variáveis de ambiente se disponíveis
-        config_data = self._override_with_env_vars(config_data)
+        config_data = ConfigManager._override_with_env_vars(config_data)
 
         try:
             return AppConfig(**config_data)
         except Exception as e:
             raise ValueError(f"Erro na validação da configuração: {e}")
 
-    def _override_with_env_vars(self, config_data: dict) -> dict:
+    @staticmethod
+    def _override_with_env_vars(config_data: dict) -> dict:
         """
         Sobrescreve configurações com variáveis de ambiente.
 
@@ -193,11 +291,22 @@ class ConfigManager:
                 "secret_access_key": "your_secret_key_here",
                 "region": "us-east-1",
             },
-            "s3": {"bucket_name": "your-backup-bucket", "prefix": "backups/"},
+            "s3": {
+                "bucket_name": "your-backup-bucket",
+                "prefix": "backups/",
+                "multipart_threshold_mb": 8,
+                "multipart_chunksize_mb": 64,
+                "transfer_concurrency": 4,
+                "verify_uploads": False,
+            },
             "backup": {
                 "source_directory": "/path/to/backup",
                 "file_extensions": ["*.txt", "*.pdf", "*.docx"],
                 "delete_after_upload": False,
+                "upload_manifest": False,
+                "skip_unchanged": False,
+                "prefetch_files": False,
+                "max_workers": 16,
             },
             "logging": {
                 "level": "INFO",
@@ -210,4 +319,7 @@ class ConfigManager:
         with open(output_path, "w", encoding="utf-8") as file:
             yaml.dump(sample_config, file, default_flow_style=False, indent=2)
 
+        # Descarta configurações em cache que possam ter sido sobrescritas
+        self._parse_config.cache_clear()
+
         print(f"Arquivo de configuração de exemplo criado em: {output_path}")
@@ -4,20 +4,96 @@ Responsável por listar arquivos locais e deletar após upload bem-sucedido.
 """
 
 import fnmatch
+import io
+import logging
 import os
+import re
+from dataclasses import dataclass
 from pathlib import Path
-from typing import List, Optional, Tuple
+from typing import (
+    Any,
+    BinaryIO,
+    FrozenSet,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+    cast,
+)
 
 from .config import BackupConfig
 from .logger import LoggerManager
 
 
+# posix_fadvise só existe em sistemas POSIX (não no Windows nem no macOS)
+_FADVISE_SUPPORTED = hasattr(os, "posix_fadvise")
+
+# Padrões do tipo "*.ext" ou ".ext", que podem ser testados pelo sufixo
+_SIMPLE_EXTENSION = re.compile(r"\*?\.([^.*?\[\]]+)")
+
+
 class FileOperationError(Exception):
     """Exceção customizada para erros de operação de arquivo."""
 
     pass
 
 
+@dataclass(frozen=True)
+class FileEntry:
+    """Arquivo encontrado na varredura, com os dados do DirEntry já lidos."""
+
+    # __slots__ declarado à mão: dataclass(slots=True) exige Python 3.10
+    __slots__ = ("path", "name", "size", "mtime")
+
+    path: str
+    name: str
+    size: int
+    mtime: float
+
+    @classmethod
+    def from_stat(
+        cls, path: str, stat_result: os.stat_result, name: Optional[str] = None
+    ) -> "FileEntry":
+        """
+        Cria um FileEntry a partir de um stat já obtido.
+
+        Args:
+            path: Caminho absoluto do arquivo
+            stat_result: Resultado de stat do arquivo
+            name: Nome do arquivo (calculado a partir do caminho se omitido)
+
+        Returns:
+            FileEntry: Entrada do arquivo
+        """
+        if name is None:
+            name = os.path.basename(path)
+        return cls(path, name, stat_result.st_size, stat_result.st_mtime)
+
+
+class _LineStream(io.RawIOBase):
+    """Arquivo somente leitura alimentado sob demanda por linhas de texto."""
+
+    def __init__(self, lines: Iterator[str]) -> None:
+        self._lines = lines
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer: Any) -> int:
+        while not self._pending:
+            line = next(self._lines, None)
+            if line is None:
+                return 0
+            self._pending = line.encode("utf-8")
+
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+
 class FileManager:
     """Gerenciador de operações de arquivo local."""
 
@@ -32,13 +108,64 @@ class FileManager:
         self.backup_config = backup_config
         self.logger_manager = logger_manager
         self.logger = logger_manager.get_logger()
+        # Raiz canônica (com separador final), resolvida uma única vez
+        self._source_root = os.path.join(
+            os.path.realpath(backup_config.source_directory), ""
+        )
+        self._delete_after = backup_config.delete_after_upload
+        # Se não há filtros de extensão ou é ['*'], inclui todos os arquivos
+        extensions = backup_config.file_extensions
+        self._include_all = not extensions or extensions == ("*",)
+        self._extension_set, self._extension_regex = self._compile_extensions(
+            extensions
+        )
+
+    @staticmethod
+    def _compile_extensions(
+        extensions: Tuple[str, ...],
+    ) -> Tuple[FrozenSet[str], Optional[Pattern[str]]]:
+        """
+        Separa os padrões de extensão em sufixos simples e globs.
+
+        Padrões do tipo "*.ext" ou ".ext" viram um conjunto de sufixos,
+        testado com uma busca em hash; os demais são compilados em uma única
+        expressão regular, usada só quando o sufixo não basta.
+
+        Args:
+            extensions: Padrões de extensão configurados
+
+        Returns:
+            Tuple[FrozenSet[str], Optional[Pattern[str]]]: Sufixos em
+            minúsculas (sem ponto) e a união dos demais padrões, ou None
+        """
+        suffixes = set()
+        patterns = []
+        for pattern in extensions:
+            match = _SIMPLE_EXTENSION.fullmatch(pattern)
+            if match is not None:
+                suffixes.add(match.group(1).lower())
+                continue
+
+            # Adiciona * inicial se necessário
+            pattern = pattern.lower()
+            if not pattern.startswith("*"):
+                pattern = "*" + pattern
+            patterns.append(fnmatch.translate(pattern))
+
+        regex = re.compile("|".join(patterns)) if patterns else None
+        return frozenset(suffixes), regex
 
-    def list_files_to_backup(self) -> List[str]:
+    def list_files_to_backup(self) -> Iterator[FileEntry]:
         """
         Lista todos os arquivos que devem ser incluídos no backup.
 
+        Os arquivos são produzidos à medida que o diretório é percorrido, de
+        modo que o consumidor pode processá-los antes do fim da varredura.
+        Tamanho e mtime vêm do DirEntry, para que upload e manifest não
+        precisem consultar cada arquivo de novo.
+
         Returns:
-            List[str]: Lista de caminhos absolutos dos arquivos
+            Iterator[FileEntry]: Arquivos, com caminho absoluto
 
         Raises:
             FileOperationError: Se houver erro ao listar arquivos
@@ -55,55 +182,84 @@ class FileManager:
             "listar_arquivos", f"Diretório: {source_path}"
         )
 
-        try:
-            all_files = []
+        return self._scan(str(source_path.absolute()))
 
-            # Itera por todos os arquivos no diretório e subdiretórios
-            for file_path in source_path.rglob("*"):
-                if file_path.is_file():
-                    if self._should_include_file(file_path):
-                        all_files.append(str(file_path.absolute()))
+    def _scan(self, root: str) -> Iterator[FileEntry]:
+        """
+        Envolve a varredura com contagem, logging e tratamento de erros.
 
-            self.logger.info(f"Encontrados {len(all_files)} arquivos para backup")
+        Args:
+            root: Diretório absoluto a percorrer
 
-            # Log detalhado dos arquivos encontrados
-            for file_str in all_files:
-                self.logger.debug(f"Arquivo para backup: {file_str}")
+        Yields:
+            FileEntry: Cada arquivo incluído no backup
 
-            return sorted(all_files)
+        Raises:
+            FileOperationError: Se houver erro ao listar arquivos
+        """
+        count = 0
+        debug_enabled = self.logger.isEnabledFor(logging.DEBUG)
+        try:
+            for entry in self._iter_files(root):
+                count += 1
+                if debug_enabled:
+                    self.logger.debug("Arquivo para backup: %s", entry.path)
+                yield entry
 
         except Exception as e:
             self.logger_manager.log_operation_error("listar_arquivos", e)
             raise FileOperationError(f"Erro ao listar arquivos: {e}")
 
-    def _should_include_file(self, file_path: Path) -> bool:
-        """
-        Verifica se um arquivo deve ser incluído no backup baseado nas extensões configuradas.
+        self.logger.info(f"Encontrados {count} arquivos para backup")
 
-        Args:
-            file_path: Caminho do arquivo
-
-        Returns:
-            bool: True se o arquivo deve ser incluído
+    def _iter_files(self, root: str) -> Iterator[FileEntry]:
         """
-        # Se não há filtros de extensão ou é ['*'], inclui todos os arquivos
-        extensions = self.backup_config.file_extensions
-        if not extensions or extensions == ["*"]:
-            return True
+        Percorre o diretório com os.scandir e uma pilha explícita.
 
-        file_name = file_path.name.lower()
+        Links simbólicos não são seguidos e o tipo de cada entrada vem do
+        próprio DirEntry, sem chamadas extras de stat. A pilha evita a cadeia
+        de geradores (e o limite de recursão) em árvores profundas.
 
-        # Verifica cada padrão de extensão
-        for pattern in extensions:
-            # Remove * inicial se presente e adiciona se necessário
-            pattern = pattern.lower()
-            if not pattern.startswith("*"):
-                pattern = "*" + pattern
-
-            if fnmatch.fnmatch(file_name, pattern):
-                return True
+        Args:
+            root: Diretório absoluto a percorrer
 
-        return False
+        Yields:
+            FileEntry: Cada arquivo incluído no backup
+        """
+        # Filtro resolvido uma vez para a varredura inteira: conjunto de
+        # sufixos e match do regex já compilado ficam em variáveis locais
+        include_all = self._include_all
+        suffixes = self._extension_set
+        regex_match = (
+            self._extension_regex.match if self._extension_regex is not None else None
+        )
+        stack = [root]
+
+        while stack:
+            directory = stack.pop()
+            try:
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            stack.append(entry.path)
+                        elif entry.is_file(follow_symlinks=False):
+                            name = entry.name
+                            if not include_all:
+                                # Filtro barato primeiro: sufixo no conjunto; o
+                                # regex só se necessário
+                                lowered = name.lower()
+                                _, dot, extension = lowered.rpartition(".")
+                                if not (dot and extension in suffixes) and (
+                                    regex_match is None or regex_match(lowered) is None
+                                ):
+                                    continue
+                            yield FileEntry.from_stat(
+                                entry.path,
+                                entry.stat(follow_symlinks=False),
+                                name,
+                            )
+            except PermissionError as e:
+                self.logger.warning(f"Sem permissão para listar diretório: {e}")
 
     def delete_file_safely(self, file_path: str) -> Tuple[bool, str]:
         """
@@ -115,56 +271,40 @@ class FileManager:
         Returns:
             Tuple[bool, str]: (sucesso, mensagem_ou_erro)
         """
-        path = Path(file_path)
-
-        # Validações de segurança
-        if not path.exists():
-            error_msg = f"Arquivo não encontrado para deleção: {file_path}"
-            self.logger.warning(error_msg)
-            return False, error_msg
-
-        if not path.is_file():
-            error_msg = f"Caminho não é um arquivo: {file_path}"
-            self.logger.error(error_msg)
-            return False, error_msg
-
         # Verifica se o arquivo está dentro do diretório de origem (segurança)
-        source_path = Path(self.backup_config.source_directory).resolve()
-        try:
-            path.resolve().relative_to(source_path)
-        except ValueError:
+        if not os.path.realpath(file_path).startswith(self._source_root):
             error_msg = f"Arquivo fora do diretório de origem: {file_path}"
             self.logger.error(error_msg)
             return False, error_msg
 
         # Verifica se deve deletar baseado na configuração
-        if not self.backup_config.delete_after_upload:
+        if not self._delete_after:
             msg = f"Deleção desabilitada na configuração: {file_path}"
             self.logger.debug(msg)
             return True, msg
 
-        self.logger_manager.log_operation_start(
-            "deletar_arquivo", f"Arquivo: {file_path}"
+        self.logger.debug(
+            "Iniciando operação: deletar_arquivo - Arquivo: %s", file_path
         )
 
         try:
-            # Obtém informações do arquivo antes de deletar
-            file_size = path.stat().st_size
-
-            # Deleta o arquivo
-            path.unlink()
-
-            # Verifica se foi deletado
-            if not path.exists():
-                success_msg = f"Arquivo deletado com sucesso ({file_size} bytes)"
-                self.logger_manager.log_file_operation("delete", file_path, True)
-                return True, success_msg
-            else:
-                error_msg = "Arquivo ainda existe após tentativa de deleção"
-                self.logger_manager.log_file_operation(
-                    "delete", file_path, False, Exception(error_msg)
-                )
-                return False, error_msg
+            # Deleta direto: o arquivo já foi encontrado pela varredura, e os
+            # casos de arquivo ausente ou diretório vêm como exceção do unlink
+            os.unlink(file_path)
+
+            # unlink levanta exceção em qualquer falha; não há o que conferir
+            self.logger_manager.log_file_operation("delete", file_path, True)
+            return True, "Arquivo deletado com sucesso"
+
+        except FileNotFoundError:
+            error_msg = f"Arquivo não encontrado para deleção: {file_path}"
+            self.logger.warning(error_msg)
+            return False, error_msg
+
+        except IsADirectoryError:
+            error_msg = f"Caminho não é um arquivo: {file_path}"
+            self.logger.error(error_msg)
+            return False, error_msg
 
         except PermissionError as e:
             error_msg = f"Permissão negada para deletar arquivo: {e}"
@@ -181,6 +321,49 @@ class FileManager:
             self.logger_manager.log_file_operation("delete", file_path, False, e)
             return False, error_msg
 
+    def prefetch_file(self, file_path: str) -> None:
+        """
+        Pede ao kernel que carregue o arquivo no page cache em segundo plano.
+
+        A chamada não bloqueia: a leitura antecipada é feita pelo kernel
+        enquanto o arquivo aguarda sua vez na fila de upload.
+
+        Args:
+            file_path: Caminho do arquivo
+        """
+        if _FADVISE_SUPPORTED:
+            self._advise(file_path, os.POSIX_FADV_WILLNEED)
+
+    def release_file_cache(self, file_path: str) -> None:
+        """
+        Indica ao kernel que as páginas do arquivo não serão mais usadas.
+
+        Args:
+            file_path: Caminho do arquivo
+        """
+        if _FADVISE_SUPPORTED:
+            self._advise(file_path, os.POSIX_FADV_DONTNEED)
+
+    def _advise(self, file_path: str, advice: int) -> None:
+        """
+        Aplica posix_fadvise ao arquivo inteiro, ignorando falhas.
+
+        Args:
+            file_path: Caminho do arquivo
+            advice: Constante os.POSIX_FADV_*
+        """
+        try:
+            fd = os.open(file_path, os.O_RDONLY)
+        except OSError:
+            return
+
+        try:
+            os.posix_fadvise(fd, 0, 0, advice)
+        except OSError as e:
+            self.logger.debug("posix_fadvise falhou para %s: %s", file_path, e)
+        finally:
+            os.close(fd)
+
     def get_file_info(self, file_path: str) -> dict:
         """
         Obtém informações detalhadas sobre um arquivo.
@@ -231,13 +414,13 @@ class FileManager:
         return f"{size_float:.1f} PB"
 
     def create_backup_manifest(
-        self, files: List[str], output_path: Optional[str] = None
+        self, files: List[FileEntry], output_path: Optional[str] = None
     ) -> str:
         """
         Cria um manifest com a lista de arquivos e suas informações.
 
         Args:
-            files: Lista de arquivos
+            files: Arquivos de list_files_to_backup
             output_path: Caminho para salvar o manifest (opcional)
 
         Returns:
@@ -254,25 +437,10 @@ class FileManager:
         manifest_path.parent.mkdir(parents=True, exist_ok=True)
 
         try:
-            with open(manifest_path, "w", encoding="utf-8") as f:
-                f.write(f"# Backup Manifest - {self._get_timestamp()}\n")
-                f.write(
-                    f"# Diretório de origem: {self.backup_config.source_directory}\n"
-                )
-                f.write(f"# Total de arquivos: {len(files)}\n\n")
-
-                total_size = 0
-                for file_path in files:
-                    info = self.get_file_info(file_path)
-                    if "error" not in info:
-                        size_bytes = info["size_bytes"]
-                        size_human = info["size_human"]
-                        total_size += size_bytes
-                        f.write(f"{file_path} ({size_human})\n")
-                    else:
-                        f.write(f"{file_path} (ERRO: {info['error']})\n")
-
-                f.write(f"\n# Tamanho total: {self._format_file_size(total_size)}\n")
+            # Monta o conteúdo inteiro e grava com uma única escrita
+            manifest_path.write_text(
+                "".join(self._manifest_lines(files)), encoding="utf-8"
+            )
 
             self.logger.info(f"Manifest criado: {manifest_path}")
             return str(manifest_path)
@@ -282,6 +450,43 @@ class FileManager:
             self.logger.error(error_msg)
             raise FileOperationError(error_msg)
 
+    def stream_backup_manifest(self, files: List[FileEntry]) -> BinaryIO:
+        """
+        Abre o manifest como um stream binário gerado sob demanda.
+
+        O conteúdo é produzido à medida que é lido, sem gravar em disco nem
+        montar o manifest inteiro em memória.
+
+        Args:
+            files: Arquivos de list_files_to_backup
+
+        Returns:
+            BinaryIO: Stream somente leitura com o conteúdo do manifest
+        """
+        stream = io.BufferedReader(_LineStream(self._manifest_lines(files)))
+        return cast(BinaryIO, stream)
+
+    def _manifest_lines(self, files: List[FileEntry]) -> Iterator[str]:
+        """
+        Gera as linhas do manifest de backup.
+
+        Args:
+            files: Arquivos de list_files_to_backup
+
+        Yields:
+            str: Linhas do manifest, com quebra de linha
+        """
+        yield f"# Backup Manifest - {self._get_timestamp()}\n"
+        yield f"# Diretório de origem: {self.backup_config.source_directory}\n"
+        yield f"# Total de arquivos: {len(files)}\n\n"
+
+        total_size = 0
+        for entry in files:
+            total_size += entry.size
+            yield f"{entry.path} ({self._format_file_size(entry.size)})\n"
+
+        yield f"\n# Tamanho total: {self._format_file_size(total_size)}\n"
+
     def _get_timestamp(self) -> str:
         """Obtém timestamp formatado para nomes de arquivo."""
         from datetime import datetime
@@ -298,21 +503,25 @@ class FileManager:
         if not self.backup_config.delete_after_upload:
             return 0
 
-        source_path = Path(self.backup_config.source_directory)
+        source_path = self.backup_config.source_directory
         removed_count = 0
 
         try:
-            # Itera pelos diretórios de forma reversa (filhos primeiro)
-            for dir_path in sorted(source_path.rglob("*"), reverse=True):
-                if dir_path.is_dir() and dir_path != source_path:
-                    try:
-                        # Tenta remover se estiver vazio
-                        dir_path.rmdir()
-                        self.logger.debug(f"Diretório vazio removido: {dir_path}")
-                        removed_count += 1
-                    except OSError:
-                        # Diretório não está vazio, continua
-                        continue
+            # os.walk de baixo para cima entrega os filhos antes dos pais e
+            # nunca trata arquivos como candidatos a rmdir
+            for dir_path, _, file_names in os.walk(source_path, topdown=False):
+                # Subdiretórios listados podem já ter sido removidos nesta
+                # passada; só a presença de arquivos descarta o diretório
+                if file_names or dir_path == source_path:
+                    continue
+                try:
+                    # Tenta remover se estiver vazio
+                    os.rmdir(dir_path)
+                    self.logger.debug("Diretório vazio removido: %s", dir_path)
+                    removed_count += 1
+                except OSError:
+                    # Diretório não está vazio, continua
+                    continue
 
             if removed_count > 0:
                 self.logger.info(f"Removidos {removed_count} diretórios vazios")
@@ -3,8 +3,10 @@ Sistema de logging configurável para a pipeline de backup S3.
 Fornece logging estruturado com rotação de arquivos e diferentes níveis.
 """
 
+import atexit
 import logging
 import logging.handlers
+import queue
 from pathlib import Path
 from typing import Optional
 
@@ -25,6 +27,7 @@ class LoggerManager:
         self.config = config
         self.logger_name = logger_name
         self._logger: Optional[logging.Logger] = None
+        self._listener: Optional[logging.handlers.QueueListener] = None
 
     def get_logger(self) -> logging.Logger:
         """
@@ -41,6 +44,10 @@ class LoggerManager:
         """
         Configura o logger com handlers de console e arquivo.
 
+        O logger só enfileira os registros; a escrita no console e no arquivo
+        é feita por uma thread de QueueListener, para que as threads de upload
+        não disputem o lock dos handlers.
+
         Returns:
             logging.Logger: Logger configurado
         """
@@ -60,7 +67,6 @@ class LoggerManager:
         console_handler = logging.StreamHandler()
         console_handler.setLevel(getattr(logging, self.config.level))
         console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
 
         # File handler com rotação
         log_file_path = Path(self.config.log_file)
@@ -71,16 +77,40 @@ class LoggerManager:
             maxBytes=self.config.max_log_size_mb * 1024 * 1024,  # Convert MB to bytes
             backupCount=self.config.backup_count,
             encoding="utf-8",
+            delay=True,  # Só abre o arquivo na primeira escrita
         )
         file_handler.setLevel(getattr(logging, self.config.level))
         file_handler.setFormatter(formatter)
-        logger.addHandler(file_handler)
+
+        # Fila entre as threads que registram e a thread que escreve
+        log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+        logger.addHandler(logging.handlers.QueueHandler(log_queue))
+
+        self._listener = logging.handlers.QueueListener(
+            log_queue, console_handler, file_handler, respect_handler_level=True
+        )
+        self._listener.start()
+        atexit.register(self.close)
 
         # Previne propagação para o root logger
         logger.propagate = False
 
         return logger
 
+    def close(self) -> None:
+        """Escreve os registros pendentes e encerra a thread de logging."""
+        if self._listener is None:
+            return
+
+        listener, self._listener = self._listener, None
+        listener.stop()
+        for handler in listener.handlers:
+            handler.close()
+
+        if self._logger is not None:
+            self._logger.handlers.clear()
+            self._logger = None
+
     def log_operation_start(self, operation: str, details: str = "") -> None:
         """
         Registra o início de uma operação.
@@ -133,6 +163,9 @@ class LoggerManager:
         """
         Registra operação em arquivo específico.
 
+        Sucessos são registrados em DEBUG, para que um backup com muitos
+        arquivos não gere uma linha INFO por arquivo; falhas continuam em ERROR.
+
         Args:
             operation: Tipo de operação (upload, delete, etc.)
             file_path: Caminho do arquivo
@@ -140,7 +173,7 @@ class LoggerManager:
             error: Exceção se houve erro
         """
         if success:
-            self.get_logger().info(f"{operation} bem-sucedido: {file_path}")
+            self.get_logger().debug("%s bem-sucedido: %s", operation, file_path)
         else:
             error_msg = str(error) if error else "Erro desconhecido"
             self.get_logger().error(f"Falha no {operation}: {file_path} - {error_msg}")
@@ -3,10 +3,27 @@ Gerenciador de operações S3 para a pipeline de backup.
 Fornece funcionalidades para upload de arquivos com tratamento de erros robusto.
 """
 
-from pathlib import Path
-from typing import Any, Dict, List, Optional, Tuple, cast
+import asyncio
+import base64
+import hashlib
+import os
+import queue
+import stat
+import threading
+from typing import (
+    Any,
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import boto3
+from boto3.s3.transfer import TransferConfig
+from botocore.config import Config
 from botocore.exceptions import (
     BotoCoreError,
     ClientError,
@@ -14,9 +31,32 @@ from botocore.exceptions import (
     PartialCredentialsError,
 )
 
+try:
+    # CRC32C acelerado por hardware (SSE4.2/ARMv8), bem mais rápido que SHA-256
+    import google_crc32c
+
+    _CRC32C_SUPPORTED = True
+except ImportError:  # Dependência opcional; usa SHA-256 da biblioteca padrão
+    _CRC32C_SUPPORTED = False
+
 from .config import AWSConfig, S3Config
+from .file_manager import FileEntry
 from .logger import LoggerManager
 
+MB = 1024 * 1024
+HASH_CHUNK_SIZE = 1 * MB
+# Páginas de listagem buscadas à frente do consumidor
+LIST_PREFETCH_PAGES = 2
+LIST_PAGE_SIZE = 1000
+
+# Marca o fim das páginas na fila da thread de listagem
+_END_OF_PAGES = object()
+
+# Espaços e caracteres de controle viram "_" nas chaves S3 (uma passada em C)
+_KEY_SANITIZE = str.maketrans(
+    {char: "_" for char in [" ", "\x7f", *map(chr, range(32))]}
+)
+
 
 class S3UploadError(Exception):
     """Exceção customizada para erros de upload S3."""
@@ -27,8 +67,18 @@ class S3UploadError(Exception):
 class S3Manager:
     """Gerenciador de operações S3."""
 
+    # Sessões boto3 compartilhadas entre instâncias, por conjunto de credenciais,
+    # para não recarregar a configuração do botocore a cada S3Manager. Sessões
+    # não são thread-safe: todo uso delas acontece sob _sessions_lock
+    _sessions: Dict[Tuple[str, str, str], boto3.session.Session] = {}
+    _sessions_lock = threading.Lock()
+
     def __init__(
-        self, aws_config: AWSConfig, s3_config: S3Config, logger_manager: LoggerManager
+        self,
+        aws_config: AWSConfig,
+        s3_config: S3Config,
+        logger_manager: LoggerManager,
+        max_workers: int = 1,
     ):
         """
         Inicializa o gerenciador S3.
@@ -37,18 +87,51 @@ class S3Manager:
             aws_config: Configuração AWS
             s3_config: Configuração S3
             logger_manager: Gerenciador de logging
+            max_workers: Número de uploads simultâneos que compartilharão o cliente
         """
         self.aws_config = aws_config
         self.s3_config = s3_config
         self.logger_manager = logger_manager
         self.logger = logger_manager.get_logger()
+        # Nome do bucket lido a cada requisição, guardado uma única vez
+        self._bucket = s3_config.bucket_name
         self._s3_client: Optional[boto3.client] = None
+        self._client_lock = threading.Lock()
+
+        # Prefixo das chaves, sem barras extras e terminado com /, calculado
+        # uma única vez
+        prefix = s3_config.prefix.strip("/")
+        self._key_prefix = f"{prefix}/" if prefix else ""
+
+        # Configuração de transferência compartilhada por todos os uploads.
+        # Com uploads paralelos, o total de threads ativas pode chegar a
+        # backup.max_workers * s3.transfer_concurrency.
+        self._transfer_config = TransferConfig(
+            multipart_threshold=s3_config.multipart_threshold_mb * MB,
+            multipart_chunksize=s3_config.multipart_chunksize_mb * MB,
+            max_concurrency=s3_config.transfer_concurrency,
+            use_threads=True,
+        )
+
+        # Pool de conexões dimensionado para todas as threads de transferência
+        self._client_config = Config(
+            max_pool_connections=max(64, max_workers * s3_config.transfer_concurrency),
+            retries={"max_attempts": 10, "mode": "adaptive"},
+            tcp_keepalive=True,
+            # A integridade é garantida pelo checksum enviado em cada upload
+            # (CRC32C no PUT único quando google-crc32c está instalado, SHA-256
+            # nos demais casos); evita um segundo hash do corpo para o SigV4
+            s3={"payload_signing_enabled": False},
+        )
 
     @property
     def s3_client(self) -> boto3.client:
         """
         Obtém o cliente S3 configurado.
 
+        O cliente é criado uma única vez e compartilhado entre as threads de
+        upload (clientes boto3 são thread-safe).
+
         Returns:
             boto3.client: Cliente S3 configurado
 
@@ -56,9 +139,38 @@ class S3Manager:
             S3UploadError: Se não conseguir criar o cliente S3
         """
         if self._s3_client is None:
-            self._s3_client = self._create_s3_client()
+            with self._client_lock:
+                if self._s3_client is None:
+                    self._s3_client = self._create_s3_client()
         return self._s3_client
 
+    def _client_from_shared_session(self) -> boto3.client:
+        """
+        Cria o cliente S3 a partir da sessão compartilhada das credenciais.
+
+        A criação do cliente também acontece sob _sessions_lock, já que a
+        sessão é compartilhada entre instâncias e não é thread-safe. O
+        cliente criado é thread-safe.
+
+        Returns:
+            boto3.client: Cliente S3
+        """
+        key = (
+            self.aws_config.access_key_id,
+            self.aws_config.secret_access_key,
+            self.aws_config.region,
+        )
+        with self._sessions_lock:
+            session = self._sessions.get(key)
+            if session is None:
+                session = boto3.session.Session(
+                    aws_access_key_id=self.aws_config.access_key_id,
+                    aws_secret_access_key=self.aws_config.secret_access_key,
+                    region_name=self.aws_config.region,
+                )
+                self._sessions[key] = session
+            return session.client("s3", config=self._client_config)
+
     def _create_s3_client(self) -> boto3.client:
         """
         Cria e configura o cliente S3.
@@ -70,30 +182,17 @@ class S3Manager:
             S3UploadError: Se não conseguir criar o cliente
         """
         try:
-            client = boto3.client(
-                "s3",
-                aws_access_key_id=self.aws_config.access_key_id,
-                aws_secret_access_key=self.aws_config.secret_access_key,
-                region_name=self.aws_config.region,
-            )
+            client = self._client_from_shared_session()
 
-            # Testa a conexão listando buckets
-            client.list_buckets()
-            self.logger.info("Cliente S3 criado e testado com sucesso")
+            # Sem chamada de teste aqui: verify_bucket_access (head_bucket) é a
+            # primeira requisição e só exige permissão no bucket configurado
+            self.logger.info("Cliente S3 criado com sucesso")
             return client
 
         except NoCredentialsError:
             raise S3UploadError("Credenciais AWS não foram encontradas")
         except PartialCredentialsError:
             raise S3UploadError("Credenciais AWS incompletas")
-        except ClientError as e:
-            error_code = e.response["Error"]["Code"]
-            if error_code == "InvalidAccessKeyId":
-                raise S3UploadError("AWS Access Key ID inválido")
-            elif error_code == "SignatureDoesNotMatch":
-                raise S3UploadError("AWS Secret Access Key inválido")
-            else:
-                raise S3UploadError(f"Erro ao criar cliente S3: {e}")
         except Exception as e:
             raise S3UploadError(f"Erro inesperado ao criar cliente S3: {e}")
 
@@ -101,6 +200,10 @@ class S3Manager:
         """
         Verifica se o bucket existe e é acessível.
 
+        É a primeira requisição ao S3, então também valida as credenciais. A
+        resposta do head_bucket não tem corpo: Access Key ID inexistente ou
+        Secret Access Key errada chegam como um 403, igual a falta de permissão.
+
         Returns:
             bool: True se o bucket é acessível
 
@@ -108,21 +211,18 @@ class S3Manager:
             S3UploadError: Se o bucket não é acessível
         """
         try:
-            self.s3_client.head_bucket(Bucket=self.s3_config.bucket_name)
-            self.logger.info(
-                f"Acesso ao bucket verificado: {self.s3_config.bucket_name}"
-            )
+            self.s3_client.head_bucket(Bucket=self._bucket)
+            self.logger.info(f"Acesso ao bucket verificado: {self._bucket}")
             return True
 
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             if error_code == "404":
-                raise S3UploadError(
-                    f"Bucket não encontrado: {self.s3_config.bucket_name}"
-                )
+                raise S3UploadError(f"Bucket não encontrado: {self._bucket}")
             elif error_code == "403":
                 raise S3UploadError(
-                    f"Acesso negado ao bucket: {self.s3_config.bucket_name}"
+                    f"Acesso negado ao bucket: {self._bucket} "
+                    "(verifique as credenciais AWS e as permissões do bucket)"
                 )
             else:
                 raise S3UploadError(f"Erro ao verificar bucket: {e}")
@@ -130,98 +230,496 @@ class S3Manager:
             raise S3UploadError(f"Erro inesperado ao verificar bucket: {e}")
 
     def upload_file(
-        self, local_file_path: str, s3_key: Optional[str] = None
+        self, local_file: Union[str, FileEntry], s3_key: Optional[str] = None
     ) -> Tuple[bool, str]:
         """
         Faz upload de um arquivo para S3.
 
         Args:
-            local_file_path: Caminho local do arquivo
+            local_file: Caminho local do arquivo, ou o FileEntry da varredura
+                (que dispensa novas consultas ao sistema de arquivos)
             s3_key: Chave S3 personalizada (opcional)
 
         Returns:
             Tuple[bool, str]: (sucesso, chave_s3_ou_erro)
         """
-        local_path = Path(local_file_path)
-
         # Validações iniciais
-        if not local_path.exists():
-            error_msg = f"Arquivo não encontrado: {local_file_path}"
+        try:
+            entry = self._file_entry(local_file)
+        except S3UploadError as e:
+            error_msg = str(e)
             self.logger.error(error_msg)
             return False, error_msg
 
-        if not local_path.is_file():
-            error_msg = f"Caminho não é um arquivo: {local_file_path}"
-            self.logger.error(error_msg)
-            return False, error_msg
+        local_path = entry.path
 
         # Define a chave S3
         if s3_key is None:
-            s3_key = self._generate_s3_key(local_path)
+            s3_key = self._generate_s3_key(entry.name)
+
+        # Por arquivo, fica em DEBUG; o andamento sai nas linhas de progresso
+        self.logger.debug(
+            "Iniciando operação: upload - Arquivo: %s -> s3://%s/%s",
+            local_path,
+            self._bucket,
+            s3_key,
+        )
+
+        try:
+            file_size = entry.size
+            self.logger.debug("Tamanho do arquivo: %d bytes", file_size)
+
+            # Guarda o mtime local para sincronizações futuras
+            metadata = {"mtime": str(int(entry.mtime))}
+
+            if file_size < self._transfer_config.multipart_threshold:
+                # PUT único com o checksum calculado uma vez aqui; o S3 valida o
+                # conteúdo recebido sem que o boto3 recalcule o hash
+                checksum_arg, checksum = self._compute_checksum(local_path)
+                with open(local_path, "rb") as body:
+                    self.s3_client.put_object(
+                        Bucket=self._bucket,
+                        Key=s3_key,
+                        Body=body,
+                        Metadata=metadata,
+                        **{checksum_arg: checksum},
+                    )
+            else:
+                self._upload_multipart(local_path, s3_key, metadata)
+
+            # O checksum enviado já faz o S3 rejeitar conteúdo corrompido; a
+            # conferência com head_object só é feita se configurada
+            if self.s3_config.verify_uploads and not self._verify_upload(
+                s3_key, file_size
+            ):
+                error_msg = "Upload aparentemente bem-sucedido mas verificação falhou"
+                self.logger_manager.log_file_operation(
+                    "upload", local_path, False, Exception(error_msg)
+                )
+                return False, error_msg
+
+            self.logger_manager.log_file_operation("upload", local_path, True)
+            return True, s3_key
+
+        except ClientError as e:
+            error_code = e.response["Error"]["Code"]
+            error_msg = f"Erro do cliente S3 ({error_code}): {e}"
+            self.logger_manager.log_file_operation("upload", local_path, False, e)
+            return False, error_msg
+
+        except BotoCoreError as e:
+            error_msg = f"Erro do BotoCore: {e}"
+            self.logger_manager.log_file_operation("upload", local_path, False, e)
+            return False, error_msg
+
+        except Exception as e:
+            error_msg = f"Erro inesperado no upload: {e}"
+            self.logger_manager.log_file_operation("upload", local_path, False, e)
+            return False, error_msg
+
+    def upload_stream(self, s3_key: str, fileobj: BinaryIO) -> Tuple[bool, str]:
+        """
+        Faz upload de um stream cujo tamanho final não é conhecido.
 
+        O conteúdo é lido em partes e enviado via multipart à medida que é
+        produzido, sem ser armazenado inteiro em memória ou em disco.
+
+        Args:
+            s3_key: Chave do objeto S3
+            fileobj: Stream binário de leitura
+
+        Returns:
+            Tuple[bool, str]: (sucesso, chave_s3_ou_erro)
+        """
         self.logger_manager.log_operation_start(
-            "upload",
-            f"Arquivo: {local_file_path} -> s3://{self.s3_config.bucket_name}/{s3_key}",
+            "upload_stream", f"s3://{self._bucket}/{s3_key}"
         )
 
         try:
-            # Obtém informações do arquivo
-            file_size = local_path.stat().st_size
-            self.logger.debug(f"Tamanho do arquivo: {file_size} bytes")
+            self.s3_client.upload_fileobj(
+                Fileobj=fileobj,
+                Bucket=self._bucket,
+                Key=s3_key,
+                Config=self._transfer_config,
+                # Sem assinatura do payload, o checksum é o que protege o envio
+                ExtraArgs={"ChecksumAlgorithm": "SHA256"},
+            )
+            self.logger_manager.log_file_operation("upload_stream", s3_key, True)
+            return True, s3_key
+
+        except (ClientError, BotoCoreError) as e:
+            error_msg = f"Erro ao enviar stream para o S3: {e}"
+            self.logger_manager.log_file_operation("upload_stream", s3_key, False, e)
+            return False, error_msg
+
+        except Exception as e:
+            error_msg = f"Erro inesperado no upload do stream: {e}"
+            self.logger_manager.log_file_operation("upload_stream", s3_key, False, e)
+            return False, error_msg
+
+    @staticmethod
+    def _file_entry(local_file: Union[str, FileEntry]) -> FileEntry:
+        """
+        Obtém o FileEntry de um arquivo, consultando o sistema só para caminhos.
+
+        Args:
+            local_file: Caminho local do arquivo, ou o FileEntry da varredura
+
+        Returns:
+            FileEntry: Entrada do arquivo
+
+        Raises:
+            S3UploadError: Se o arquivo não existir ou não for um arquivo regular
+        """
+        if isinstance(local_file, FileEntry):
+            return local_file
+
+        try:
+            file_stat = os.stat(local_file)
+        except FileNotFoundError:
+            raise S3UploadError(f"Arquivo não encontrado: {local_file}")
+        except OSError as e:
+            raise S3UploadError(f"Erro ao acessar arquivo {local_file}: {e}")
+
+        if not stat.S_ISREG(file_stat.st_mode):
+            raise S3UploadError(f"Caminho não é um arquivo: {local_file}")
+        return FileEntry.from_stat(local_file, file_stat)
+
+    def _upload_multipart(
+        self, local_path: str, s3_key: str, metadata: Dict[str, str]
+    ) -> None:
+        """
+        Envia um arquivo grande via multipart com o cliente síncrono.
+
+        O checksum SHA-256 é calculado por parte durante o envio. O tamanho
+        das partes vem de um stat feito pelo próprio s3transfer no início do
+        envio, não da varredura: um arquivo que cresceu desde então não é
+        enviado truncado. O caminho (e não um arquivo aberto) permite ler as
+        partes em paralelo, sem copiá-las para a memória.
+
+        Args:
+            local_path: Caminho local do arquivo
+            s3_key: Chave S3 de destino
+            metadata: Metadados do objeto
+
+        Raises:
+            ClientError: Se o S3 recusar alguma das requisições
+        """
+        self.s3_client.upload_file(
+            Filename=local_path,
+            Bucket=self._bucket,
+            Key=s3_key,
+            Config=self._transfer_config,
+            ExtraArgs={"Metadata": metadata, "ChecksumAlgorithm": "SHA256"},
+        )
+
+    @staticmethod
+    def _compute_checksum(local_path: str) -> Tuple[str, str]:
+        """
+        Calcula o checksum do arquivo em blocos, no formato esperado pelo S3.
+
+        Usa CRC32C quando google-crc32c está instalado e SHA-256 caso contrário.
+
+        Args:
+            local_path: Caminho local do arquivo
+
+        Returns:
+            Tuple[str, str]: (parâmetro do put_object, checksum em base64)
+        """
+        with open(local_path, "rb") as file:
+            return S3Manager._checksum_chunks(
+                iter(lambda: file.read(HASH_CHUNK_SIZE), b"")
+            )
+
+    @staticmethod
+    def _read_with_checksum(local_path: str) -> Tuple[bytes, str, str]:
+        """
+        Lê o arquivo inteiro uma única vez e calcula o checksum do conteúdo.
+
+        Args:
+            local_path: Caminho local do arquivo
+
+        Returns:
+            Tuple[bytes, str, str]: (conteúdo, parâmetro do put_object, checksum)
+        """
+        with open(local_path, "rb") as file:
+            body = file.read()
+        checksum_arg, checksum = S3Manager._checksum_chunks((body,))
+        return body, checksum_arg, checksum
+
+    @staticmethod
+    def _checksum_chunks(chunks: Iterable[bytes]) -> Tuple[str, str]:
+        """
+        Calcula o checksum de uma sequência de blocos, no formato do S3.
+
+        Args:
+            chunks: Blocos do conteúdo, em ordem
+
+        Returns:
+            Tuple[str, str]: (parâmetro do put_object, checksum em base64)
+        """
+        if _CRC32C_SUPPORTED:
+            crc = google_crc32c.Checksum()
+            for chunk in chunks:
+                crc.update(chunk)
+            return "ChecksumCRC32C", base64.b64encode(crc.digest()).decode("ascii")
+
+        digest = hashlib.sha256()
+        for chunk in chunks:
+            digest.update(chunk)
+        return "ChecksumSHA256", base64.b64encode(digest.digest()).decode("ascii")
+
+    def iter_existing(
+        self, prefix: Optional[str] = None
+    ) -> Iterator[Tuple[str, Tuple[int, float]]]:
+        """
+        Percorre os objetos já existentes no bucket, página a página.
+
+        Os pares podem ser passados direto para dict(), montando o índice
+        chave -> (tamanho, LastModified) sem uma lista intermediária.
+
+        Args:
+            prefix: Prefixo para filtrar objetos (padrão: o das chaves geradas)
+
+        Yields:
+            Tuple[str, Tuple[int, float]]: (chave, (tamanho, last_modified))
+        """
+        for obj in self.list_bucket_objects(prefix):
+            yield obj["Key"], (obj["Size"], obj["LastModified"].timestamp())
+
+    @staticmethod
+    def is_unchanged(
+        remote: Optional[Tuple[int, float]], local_size: int, local_mtime: float
+    ) -> bool:
+        """
+        Compara um objeto de iter_existing com o tamanho e mtime locais.
+
+        A listagem não traz os metadados do objeto, então o critério é o
+        mesmo do ``aws s3 sync``: mesmo tamanho e arquivo local não modificado
+        depois do envio.
+
+        Args:
+            remote: (tamanho, last_modified) do objeto, ou None se não existe
+            local_size: Tamanho do arquivo local em bytes
+            local_mtime: Data de modificação do arquivo local
+
+        Returns:
+            bool: True se o objeto corresponde ao arquivo local
+        """
+        if remote is None:
+            return False
+        remote_size, remote_modified = remote
+        # LastModified tem resolução de segundos
+        return remote_size == local_size and int(local_mtime) <= remote_modified
+
+    def matches_remote(self, s3_key: str, local_size: int, local_mtime: float) -> bool:
+        """
+        Confere com head_object se o objeto foi enviado a partir deste arquivo.
+
+        Ao contrário de is_unchanged, compara o mtime exato gravado nos
+        metadados do envio; arquivos diferentes com a mesma chave (mesmo nome
+        em diretórios distintos) não passam por esta verificação.
+
+        Args:
+            s3_key: Chave do objeto S3
+            local_size: Tamanho do arquivo local em bytes
+            local_mtime: Data de modificação do arquivo local
+
+        Returns:
+            bool: True se tamanho e mtime do objeto correspondem ao arquivo
+        """
+        try:
+            response = self.s3_client.head_object(Bucket=self._bucket, Key=s3_key)
+        except ClientError as e:
+            self.logger.debug("head_object falhou para %s: %s", s3_key, e)
+            return False
+        return self._head_matches(response, local_size, local_mtime)
 
-            # Faz o upload
-            self.s3_client.upload_file(
-                Filename=str(local_path), Bucket=self.s3_config.bucket_name, Key=s3_key
+    async def matches_remote_async(
+        self, client: Any, s3_key: str, local_size: int, local_mtime: float
+    ) -> bool:
+        """
+        Versão assíncrona de matches_remote.
+
+        Args:
+            client: Cliente S3 assíncrono criado por create_async_client
+            s3_key: Chave do objeto S3
+            local_size: Tamanho do arquivo local em bytes
+            local_mtime: Data de modificação do arquivo local
+
+        Returns:
+            bool: True se tamanho e mtime do objeto correspondem ao arquivo
+        """
+        try:
+            response = await client.head_object(Bucket=self._bucket, Key=s3_key)
+        except ClientError as e:
+            self.logger.debug("head_object falhou para %s: %s", s3_key, e)
+            return False
+        return self._head_matches(response, local_size, local_mtime)
+
+    @staticmethod
+    def _head_matches(
+        response: Dict[str, Any], local_size: int, local_mtime: float
+    ) -> bool:
+        """
+        Compara a resposta de head_object com o tamanho e mtime locais.
+
+        Args:
+            response: Resposta de head_object
+            local_size: Tamanho do arquivo local em bytes
+            local_mtime: Data de modificação do arquivo local
+
+        Returns:
+            bool: True se tamanho e metadado mtime correspondem
+        """
+        remote_size: int = response["ContentLength"]
+        remote_mtime: Optional[str] = response.get("Metadata", {}).get("mtime")
+        return remote_size == local_size and remote_mtime == str(int(local_mtime))
+
+    def create_async_client(self) -> Any:
+        """
+        Cria um cliente S3 assíncrono (aioboto3), para uso com ``async with``.
+
+        Returns:
+            Any: Context manager assíncrono do cliente S3
+
+        Raises:
+            S3UploadError: Se aioboto3 não estiver instalado
+        """
+        try:
+            # Importado só aqui: carregar o aioboto3 custa centenas de ms, que o
+            # modo síncrono não precisa pagar
+            import aioboto3
+        except ImportError:
+            raise S3UploadError(
+                "Modo assíncrono requer aioboto3. Instale com: pip install aioboto3"
             )
 
-            # Verifica se o upload foi bem-sucedido
-            if self._verify_upload(s3_key, file_size):
-                self.logger_manager.log_file_operation("upload", str(local_path), True)
-                return True, s3_key
+        session = aioboto3.Session(
+            aws_access_key_id=self.aws_config.access_key_id,
+            aws_secret_access_key=self.aws_config.secret_access_key,
+            region_name=self.aws_config.region,
+        )
+        return session.client("s3", config=self._client_config)
+
+    async def upload_file_async(
+        self,
+        client: Any,
+        local_file: Union[str, FileEntry],
+        s3_key: Optional[str] = None,
+    ) -> Tuple[bool, str]:
+        """
+        Versão assíncrona de upload_file, usando um cliente aioboto3.
+
+        Args:
+            client: Cliente S3 assíncrono criado por create_async_client
+            local_file: Caminho local do arquivo, ou o FileEntry da varredura
+            s3_key: Chave S3 personalizada (opcional)
+
+        Returns:
+            Tuple[bool, str]: (sucesso, chave_s3_ou_erro)
+        """
+        try:
+            entry = self._file_entry(local_file)
+        except S3UploadError as e:
+            error_msg = str(e)
+            self.logger.error(error_msg)
+            return False, error_msg
+
+        local_path = entry.path
+
+        if s3_key is None:
+            s3_key = self._generate_s3_key(entry.name)
+
+        bucket = self._bucket
+        loop = asyncio.get_running_loop()
+
+        try:
+            metadata = {"mtime": str(int(entry.mtime))}
+
+            if entry.size < self._transfer_config.multipart_threshold:
+                # Uma única leitura, com o checksum, fora do event loop
+                body, checksum_arg, checksum = await loop.run_in_executor(
+                    None, self._read_with_checksum, local_path
+                )
+                await client.put_object(
+                    Bucket=bucket,
+                    Key=s3_key,
+                    Body=body,
+                    Metadata=metadata,
+                    **{checksum_arg: checksum},
+                )
             else:
-                error_msg = "Upload aparentemente bem-sucedido mas verificação falhou"
-                self.logger_manager.log_file_operation(
-                    "upload", str(local_path), False, Exception(error_msg)
+                # O upload_file do aioboto3 não repassa os checksums das partes
+                # ao concluir o multipart; usa o mesmo envio do modo síncrono,
+                # com os mesmos ExtraArgs, em uma thread
+                await loop.run_in_executor(
+                    None,
+                    self._upload_multipart,
+                    local_path,
+                    s3_key,
+                    metadata,
                 )
-                return False, error_msg
+
+            if self.s3_config.verify_uploads:
+                response = await client.head_object(Bucket=bucket, Key=s3_key)
+                if response["ContentLength"] != entry.size:
+                    error_msg = (
+                        "Upload aparentemente bem-sucedido mas verificação falhou"
+                    )
+                    self.logger_manager.log_file_operation(
+                        "upload", local_path, False, Exception(error_msg)
+                    )
+                    return False, error_msg
+
+            self.logger_manager.log_file_operation("upload", local_path, True)
+            return True, s3_key
 
         except ClientError as e:
             error_code = e.response["Error"]["Code"]
             error_msg = f"Erro do cliente S3 ({error_code}): {e}"
-            self.logger_manager.log_file_operation("upload", str(local_path), False, e)
+            self.logger_manager.log_file_operation("upload", local_path, False, e)
             return False, error_msg
 
         except BotoCoreError as e:
             error_msg = f"Erro do BotoCore: {e}"
-            self.logger_manager.log_file_operation("upload", str(local_path), False, e)
+            self.logger_manager.log_file_operation("upload", local_path, False, e)
             return False, error_msg
 
         except Exception as e:
             error_msg = f"Erro inesperado no upload: {e}"
-            self.logger_manager.log_file_operation("upload", str(local_path), False, e)
+            self.logger_manager.log_file_operation("upload", local_path, False, e)
             return False, error_msg
 
-    def _generate_s3_key(self, local_path: Path) -> str:
+    def generate_s3_key(self, local_file: Union[str, FileEntry]) -> str:
+        """
+        Gera a chave S3 que será usada para um arquivo local.
+
+        Args:
+            local_file: Caminho local do arquivo, ou o FileEntry da varredura
+
+        Returns:
+            str: Chave S3 gerada
+        """
+        if isinstance(local_file, FileEntry):
+            return self._generate_s3_key(local_file.name)
+        return self._generate_s3_key(os.path.basename(local_file))
+
+    def _generate_s3_key(self, file_name: str) -> str:
         """
         Gera a chave S3 para o arquivo.
 
         Args:
-            local_path: Caminho local do arquivo
+            file_name: Nome do arquivo local
 
         Returns:
             str: Chave S3 gerada
         """
         # Remove caracteres especiais e espaços do nome do arquivo
-        filename = local_path.name.replace(" ", "_")
+        filename = file_name.translate(_KEY_SANITIZE)
 
         # Combina prefixo com nome do arquivo
-        if self.s3_config.prefix:
-            # Remove barras extras e garante que termina com /
-            prefix = self.s3_config.prefix.strip("/")
-            if prefix:
-                return f"{prefix}/{filename}"
-
-        return filename
+        return self._key_prefix + filename
 
     def _verify_upload(self, s3_key: str, expected_size: int) -> bool:
         """
@@ -235,13 +733,13 @@ class S3Manager:
             bool: True se o arquivo existe e tem o tamanho correto
         """
         try:
-            response = self.s3_client.head_object(
-                Bucket=self.s3_config.bucket_name, Key=s3_key
-            )
+            response = self.s3_client.head_object(Bucket=self._bucket, Key=s3_key)
 
             actual_size = response["ContentLength"]
             if actual_size == expected_size:
-                self.logger.debug(f"Upload verificado: {s3_key} ({actual_size} bytes)")
+                self.logger.debug(
+                    "Upload verificado: %s (%d bytes)", s3_key, actual_size
+                )
                 return True
             else:
                 self.logger.error(
@@ -254,30 +752,105 @@ class S3Manager:
             self.logger.error(f"Erro ao verificar upload: {e}")
             return False
 
-    def list_bucket_objects(self, prefix: Optional[str] = None) -> List[Dict[str, Any]]:
+    def list_bucket_objects(
+        self,
+        prefix: Optional[str] = None,
+        start_after: Optional[str] = None,
+        delimiter: Optional[str] = None,
+    ) -> Iterator[Dict[str, Any]]:
         """
-        Lista objetos no bucket S3.
+        Lista objetos no bucket S3, percorrendo todas as páginas.
+
+        A próxima página é buscada em uma thread enquanto o chamador processa
+        a atual, sobrepondo a latência de rede com o processamento. Os filtros
+        são aplicados pelo próprio S3, reduzindo páginas e bytes transferidos.
 
         Args:
             prefix: Prefixo para filtrar objetos
+            start_after: Lista apenas chaves posteriores a esta (ordem lexicográfica)
+            delimiter: Agrupa chaves por este separador; com "/", as "pastas" abaixo
+                do prefixo aparecem como entradas de CommonPrefixes
 
-        Returns:
-            list: Lista de objetos no bucket
+        Yields:
+            dict: Objeto do bucket, como em Contents de list_objects_v2, ou, com
+            delimiter, um item de CommonPrefixes ({"Prefix": ...})
         """
-        try:
-            if prefix is None:
-                prefix = self.s3_config.prefix
-
-            response = self.s3_client.list_objects_v2(
-                Bucket=self.s3_config.bucket_name, Prefix=prefix
-            )
+        if prefix is None:
+            # Mesmo prefixo normalizado usado em _generate_s3_key
+            prefix = self._key_prefix
+
+        params: Dict[str, Any] = {
+            "Bucket": self._bucket,
+            "Prefix": prefix,
+        }
+        if start_after is not None:
+            params["StartAfter"] = start_after
+        if delimiter is not None:
+            params["Delimiter"] = delimiter
+
+        paginator = self.s3_client.get_paginator("list_objects_v2")
+        pages = paginator.paginate(
+            **params, PaginationConfig={"PageSize": LIST_PAGE_SIZE}
+        )
 
-            contents = response.get("Contents", [])
-            return cast(List[Dict[str, Any]], contents)
+        try:
+            for page in self._prefetch_pages(pages):
+                yield from page.get("Contents", ())
+                yield from page.get("CommonPrefixes", ())
 
         except ClientError as e:
             self.logger.error(f"Erro ao listar objetos do bucket: {e}")
-            return []
+
+    @staticmethod
+    def _prefetch_pages(pages: Iterable[Dict[str, Any]]) -> Iterator[Dict[str, Any]]:
+        """
+        Busca as páginas em uma thread, no máximo LIST_PREFETCH_PAGES à frente.
+
+        Args:
+            pages: Páginas do paginator (cada uma é uma requisição)
+
+        Yields:
+            dict: Páginas, na ordem original
+
+        Raises:
+            Exception: O erro ocorrido na thread ao buscar uma página
+        """
+        buffer: "queue.Queue[Any]" = queue.Queue(maxsize=LIST_PREFETCH_PAGES)
+        stop = threading.Event()
+
+        def put(item: Any) -> bool:
+            # Desiste se o consumidor parou de ler, para não prender a thread
+            while not stop.is_set():
+                try:
+                    buffer.put(item, timeout=0.1)
+                    return True
+                except queue.Full:
+                    pass
+            return False
+
+        def produce() -> None:
+            try:
+                for page in pages:
+                    if not put(page):
+                        return
+            except Exception as e:
+                put(e)
+                return
+            put(_END_OF_PAGES)
+
+        thread = threading.Thread(target=produce, name="s3-list-prefetch", daemon=True)
+        thread.start()
+
+        try:
+            while True:
+                item = buffer.get()
+                if item is _END_OF_PAGES:
+                    return
+                if isinstance(item, Exception):
+                    raise item
+                yield item
+        finally:
+            stop.set()
 
     def get_upload_url(self, s3_key: str) -> str:
         """
@@ -289,4 +862,6 @@ class S3Manager:
         Returns:
             str: URL do objeto
         """
-        return f"https://{self.s3_config.bucket_name}.s3.{self.aws_config.region}.amazonaws.com/{s3_key}"
+        return (
+            f"https://{self._bucket}.s3.{self.aws_config.region}.amazonaws.com/{s3_key}"
+        )